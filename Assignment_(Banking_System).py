@@ -1,9 +1,25 @@
 import sqlite3
 import random
+import threading
 from datetime import datetime
 
 DB_FILE = "banking_system.db"
 
+# Ledger mode: credits, debits and transfers only append rows to the "ledger" table
+# instead of updating users.balance in place. A balance is the user's latest snapshot
+# plus the ledger entries after it. The mode is recorded in the meta table on first
+# run and the program refuses to start against a database using the other mode.
+# Every operation is still one commit, so write throughput matches the legacy path
+# (see bench_ledger.py); the ledger is for the replayable audit trail.
+LEDGER_MODE = False
+SNAPSHOT_INTERVAL = 60  # Seconds between background snapshot compactions
+
+MINOR_UNITS = 100  # Ledger amounts and snapshot balances are integers in 1/100 of the currency unit
+
+ledger_balances = {}  # user_id -> balance in minor units, rebuilt from the ledger at startup
+ledger_last_seq = 0  # Last ledger seq reflected in ledger_balances
+compactor_errors = []  # Filled by the compactor thread, reported from the menus
+
 def db_connect():
     return sqlite3.connect(DB_FILE)
 
@@ -49,8 +65,191 @@ def setup_database():
             )
         ''')
 
+        # Create ledger table (append-only, seq is the monotonically increasing sequence number)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ledger (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                amount INTEGER NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_id) REFERENCES users(id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS ledger_user_seq ON ledger (user_id, seq)')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS ledger_no_update BEFORE UPDATE ON ledger
+            BEGIN SELECT RAISE(ABORT, 'ledger is append-only'); END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS ledger_no_delete BEFORE DELETE ON ledger
+            BEGIN SELECT RAISE(ABORT, 'ledger is append-only'); END
+        ''')
+
+        # Create balance snapshot table (balance of each user as of ledger entry last_seq)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS balance_snapshot (
+                user_id INTEGER PRIMARY KEY,
+                balance INTEGER NOT NULL,
+                last_seq INTEGER NOT NULL,
+                FOREIGN KEY(user_id) REFERENCES users(id)
+            )
+        ''')
+
+        # Create meta table (records the balance mode of this database)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        ''')
+        # A database with legacy "transaction" history stays in legacy mode, ledger history would hide it
+        cursor.execute('SELECT EXISTS (SELECT 1 FROM "transaction")')
+        has_legacy_history = cursor.fetchone()[0]
+        cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('ledger_mode', ?)",
+                       (str(int(LEDGER_MODE and not has_legacy_history)),))
+
+        # In ledger mode users.balance is only the opening balance and must not move
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS users_balance_ledger_mode BEFORE UPDATE OF balance ON users
+            WHEN (SELECT value FROM meta WHERE key = 'ledger_mode') = '1'
+            BEGIN SELECT RAISE(ABORT, 'database is in ledger mode'); END
+        ''')
+
+        conn.commit()
+
+def check_ledger_mode():
+    with db_connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM meta WHERE key = 'ledger_mode'")
+        stored_mode = cursor.fetchone()[0] == '1'
+
+    if stored_mode != LEDGER_MODE:
+        print(f"Database {DB_FILE} uses {'ledger' if stored_mode else 'legacy'} balances "
+              f"but LEDGER_MODE is {LEDGER_MODE}. Refusing to start.")
+        return False
+    return True
+
+# Ledger Balances and Snapshots
+def to_minor_units(amount):
+    return round(amount * MINOR_UNITS)
+
+def from_minor_units(units):
+    return units / MINOR_UNITS
+
+def ledger_head(cursor):
+    cursor.execute('SELECT COALESCE(MAX(seq), 0) FROM ledger')
+    return cursor.fetchone()[0]
+
+def query_ledger_balances(cursor, last_seq, user_id=None, changed_since=None):
+    # Balance = latest snapshot (or the opening users.balance) + ledger entries up to last_seq
+    query = f'''
+        SELECT users.id,
+               COALESCE(balance_snapshot.balance, CAST(ROUND(users.balance * {MINOR_UNITS}) AS INTEGER)) + COALESCE((
+                   SELECT SUM(ledger.amount) FROM ledger
+                   WHERE ledger.user_id = users.id
+                     AND ledger.seq > COALESCE(balance_snapshot.last_seq, 0)
+                     AND ledger.seq <= ?
+               ), 0)
+        FROM users
+        LEFT JOIN balance_snapshot ON balance_snapshot.user_id = users.id
+    '''
+    params = [last_seq]
+    if user_id is not None:
+        query += 'WHERE users.id = ?'
+        params.append(user_id)
+    elif changed_since is not None:
+        query += 'WHERE users.id IN (SELECT user_id FROM ledger WHERE seq > ? AND seq <= ?)'
+        params += [changed_since, last_seq]
+    cursor.execute(query, params)
+    return dict(cursor.fetchall())
+
+def cache_ledger_balances(cursor, last_seq):
+    global ledger_last_seq
+    ledger_balances.clear()
+    ledger_balances.update(query_ledger_balances(cursor, last_seq))
+    ledger_last_seq = last_seq
+
+def load_ledger_balances():
+    with db_connect() as conn:
+        cursor = conn.cursor()
+        cache_ledger_balances(cursor, ledger_head(cursor))
+
+def refresh_ledger_balances(cursor, user_ids):
+    # Reload the users another process appended entries for since the cache was built,
+    # and load users registered after it was built
+    global ledger_last_seq
+    last_seq = ledger_head(cursor)
+    if last_seq != ledger_last_seq:
+        ledger_balances.update(query_ledger_balances(cursor, last_seq, changed_since=ledger_last_seq))
+        ledger_last_seq = last_seq
+
+    for user_id in user_ids:
+        if user_id not in ledger_balances:
+            ledger_balances.update(query_ledger_balances(cursor, last_seq, user_id))
+    return {user_id: ledger_balances[user_id] for user_id in user_ids}
+
+def get_balance(user_id):
+    if not LEDGER_MODE:
+        with db_connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT balance FROM users WHERE id = ?', (user_id,))
+            return cursor.fetchone()[0]
+
+    with db_connect() as conn:
+        return from_minor_units(refresh_ledger_balances(conn.cursor(), [user_id])[user_id])
+
+def begin_ledger_write(cursor, user_ids):
+    # Take the write lock first so the returned balances include every committed entry,
+    # including those appended by other processes
+    cursor.execute('BEGIN IMMEDIATE')
+    return refresh_ledger_balances(cursor, user_ids)
+
+def append_ledger(conn, entries):
+    # entries: list of (user_id, type, signed amount in minor units), committed together
+    global ledger_last_seq
+    cursor = conn.cursor()
+    cursor.executemany('INSERT INTO ledger (user_id, type, amount) VALUES (?, ?, ?)', entries)
+    last_seq = ledger_head(cursor)
+    conn.commit()
+
+    for user_id, _, amount in entries:
+        ledger_balances[user_id] += amount
+    ledger_last_seq = last_seq
+
+def compact_ledger():
+    with db_connect() as conn:
+        cursor = conn.cursor()
+        last_seq = ledger_head(cursor)
+        cursor.execute('SELECT COALESCE(MAX(last_seq), 0) FROM balance_snapshot')
+        snapshot_seq = cursor.fetchone()[0]
+        if last_seq <= snapshot_seq:
+            return
+
+        # Only users with entries since the previous compaction have a stale snapshot
+        balances = query_ledger_balances(cursor, last_seq, changed_since=snapshot_seq)
+        cursor.executemany('INSERT OR REPLACE INTO balance_snapshot (user_id, balance, last_seq) VALUES (?, ?, ?)',
+                           [(user_id, balance, last_seq) for user_id, balance in balances.items()])
         conn.commit()
 
+def start_compactor():
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(SNAPSHOT_INTERVAL):
+            try:
+                compact_ledger()
+            except sqlite3.Error as e:
+                compactor_errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return stop, thread
+
+def report_compactor_errors():
+    while compactor_errors:
+        print(f"Snapshot compaction failed: {compactor_errors.pop(0)}")
+
 # User Management and Validation
 def generate_account_number():
     return str(random.randint(1000000000, 9999999999))  # Generates a 10-digit unique account number
@@ -147,25 +346,29 @@ def show_user():
         
     if user:
         print(f"\nUser Details:\nName: {user[1]}\nAccount Number: {user[2]}\nDate of Birth: {user[3]}\nCity: {user[4]}\n"
-              f"Contact Number: {user[5]}\nEmail: {user[6]}\nAddress: {user[7]}\nBalance: {user[8]}")
+              f"Contact Number: {user[5]}\nEmail: {user[6]}\nAddress: {user[7]}\nBalance: {get_balance(user[0]) if LEDGER_MODE else user[8]}")
     else:
         print("User not found!")
 
 def show_balance(user_id):
-    with db_connect() as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT balance FROM users WHERE id = ?', (user_id,))
-        balance = cursor.fetchone()[0]
-        print(f"Your balance: {balance}")
+    print(f"Your balance: {get_balance(user_id)}")
 
 def transaction_history(user_id):
     with db_connect() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            SELECT type, amount, timestamp 
-            FROM "transaction" 
-            WHERE user_id = ?
-        ''', (user_id,))
+        if LEDGER_MODE:
+            cursor.execute('''
+                SELECT type, ABS(amount) / ?, timestamp
+                FROM ledger
+                WHERE user_id = ?
+                ORDER BY seq
+            ''', (float(MINOR_UNITS), user_id))
+        else:
+            cursor.execute('''
+                SELECT type, amount, timestamp 
+                FROM "transaction" 
+                WHERE user_id = ?
+            ''', (user_id,))
         transactions = cursor.fetchall()
 
     if transactions:
@@ -181,6 +384,18 @@ def credit_amount(user_id):
         print("Amount should be greater than zero.")
         return
 
+    if LEDGER_MODE:
+        units = to_minor_units(amount)
+        if units <= 0:
+            print("Amount should be greater than zero.")
+            return
+
+        with db_connect() as conn:
+            begin_ledger_write(conn.cursor(), [user_id])
+            append_ledger(conn, [(user_id, 'Credit', units)])
+        print(f"{amount} credited successfully!")
+        return
+
     with db_connect() as conn:
         cursor = conn.cursor()
         cursor.execute('UPDATE users SET balance = balance + ? WHERE id = ?', (amount, user_id))
@@ -195,6 +410,23 @@ def debit_amount(user_id):
         print("Amount should be greater than zero.")
         return
 
+    if LEDGER_MODE:
+        units = to_minor_units(amount)
+        if units <= 0:
+            print("Amount should be greater than zero.")
+            return
+
+        with db_connect() as conn:
+            balances = begin_ledger_write(conn.cursor(), [user_id])
+
+            # Same floor as the CHECK(balance >= 2000) constraint on users
+            if balances[user_id] - units >= to_minor_units(2000):
+                append_ledger(conn, [(user_id, 'Debit', -units)])
+                print(f"{amount} debited successfully!")
+            else:
+                print("Insufficient balance!")
+        return
+
     with db_connect() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT balance FROM users WHERE id = ?', (user_id,))
@@ -260,6 +492,10 @@ def transfer_amount(user_id):
         print("Amount should be greater than zero.")
         return
 
+    if LEDGER_MODE:
+        transfer_amount_ledger(user_id, recipient_account, amount)
+        return
+
     with db_connect() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT balance FROM users WHERE id = ?', (user_id,))
@@ -285,6 +521,33 @@ def transfer_amount(user_id):
 
     print(f"{amount} transferred successfully to account {recipient_account}!")
 
+def transfer_amount_ledger(user_id, recipient_account, amount):
+    units = to_minor_units(amount)
+    if units <= 0:
+        print("Amount should be greater than zero.")
+        return
+
+    with db_connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT id FROM users WHERE account_number = ?', (recipient_account,))
+        recipient = cursor.fetchone()
+
+        if not recipient:
+            print("Recipient account not found!")
+            return
+
+        recipient_id = recipient[0]
+        balances = begin_ledger_write(cursor, [user_id, recipient_id])
+
+        # Same floor as the CHECK(balance >= 2000) constraint on users
+        if balances[user_id] - units < to_minor_units(2000):
+            print("Insufficient balance!")
+            return
+
+        append_ledger(conn, [(user_id, 'Transfer Out', -units), (recipient_id, 'Transfer In', units)])
+
+    print(f"{amount} transferred successfully to account {recipient_account}!")
+
 def login():
     account_number = input("Enter your account number: ").strip()
     password = input("Enter your password: ").strip()
@@ -304,7 +567,7 @@ def login():
         if user[1] == 0:
             print("Account is deactivated.")
             return None
-        print(f"Login successful! Your balance is {user[2]}")
+        print(f"Login successful! Your balance is {get_balance(user[0]) if LEDGER_MODE else user[2]}")
         return user[0]
     else:
         print("Invalid account number or password.")
@@ -312,6 +575,7 @@ def login():
 
 def main_menu(user_id):
     while True:
+        report_compactor_errors()
         print("\n1. Show Balance")
         print("2. Transaction History")
         print("3. Credit Amount")
@@ -347,7 +611,16 @@ def main_menu(user_id):
 
 def main():
     setup_database()
+    if not check_ledger_mode():
+        return
+
+    compactor = None
+    if LEDGER_MODE:
+        load_ledger_balances()
+        compactor = start_compactor()
+
     while True:
+        report_compactor_errors()
         print("\nWelcome to Banking System")
         print("1. Login")
         print("2. Register")
@@ -364,6 +637,10 @@ def main():
         elif choice == '3':
             show_user()
         elif choice == '4':
+            if compactor:
+                stop, thread = compactor
+                stop.set()
+                thread.join()
             print("Thank you for using the banking system. Goodbye!")
             break
         else:
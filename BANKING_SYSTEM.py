@@ -49,8 +49,27 @@ def setup_database():
             )
         ''')
 
+        # Create meta table (records the balance mode of this database)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('ledger_mode', '0')")
+
         conn.commit()
 
+def check_ledger_mode():
+    # Balances in a ledger mode database live in the ledger table, which this program does not use
+    with db_connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM meta WHERE key = 'ledger_mode'")
+        if cursor.fetchone()[0] == '1':
+            print(f"Database {DB_FILE} uses ledger balances. Refusing to start.")
+            return False
+    return True
+
 # User Management and Validation
 def generate_account_number():
     return str(random.randint(1000000000, 9999999999))  # Generates a 10-digit unique account number
@@ -240,6 +259,8 @@ def debit_amount(user_id):
 # Main Menu
 def main():
     setup_database()
+    if not check_ledger_mode():
+        return
 
     current_user_id = None
     while True:
@@ -0,0 +1,71 @@
+import builtins
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import time
+
+# Benchmark transfer_amount on the legacy path (UPDATE users + INSERT "transaction")
+# against ledger mode (INSERT ledger only).
+# Usage: python bench_ledger.py [transfers] [rounds]
+
+BANK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Assignment_(Banking_System).py")
+
+def load_bank():
+    spec = importlib.util.spec_from_file_location("bank", BANK_FILE)
+    bank = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bank)
+    return bank
+
+def bench_transfers(ledger_mode, transfers, db_dir):
+    bank = load_bank()
+    bank.DB_FILE = os.path.join(db_dir, f"bench_{'ledger' if ledger_mode else 'legacy'}.db")
+    bank.LEDGER_MODE = ledger_mode
+    if os.path.exists(bank.DB_FILE):
+        os.remove(bank.DB_FILE)
+
+    bank.setup_database()
+    with bank.db_connect() as conn:
+        cursor = conn.cursor()
+        for i, account_number in enumerate(("1000000001", "1000000002")):
+            cursor.execute('''
+                INSERT INTO users (name, account_number, dob, city, contact_number, email, address, balance)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (f"bench{i}", account_number, "01-01-2000", "city", "9000000000", f"bench{i}@gmail.com",
+                  "address", 10 ** 9))
+        conn.commit()
+    if ledger_mode:
+        bank.load_ledger_balances()
+
+    answers = iter(["1000000002", "1"] * transfers)
+    real_input = builtins.input
+    builtins.input = lambda prompt="": next(answers)
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(transfers):
+                bank.transfer_amount(1)
+        elapsed = time.perf_counter() - start
+    finally:
+        builtins.input = real_input
+
+    # Both paths must end with the same balances
+    assert bank.get_balance(1) == 10 ** 9 - transfers
+    assert bank.get_balance(2) == 10 ** 9 + transfers
+    return transfers / elapsed
+
+def main():
+    transfers = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        for round_number in range(1, rounds + 1):
+            legacy = bench_transfers(False, transfers, db_dir)
+            ledger = bench_transfers(True, transfers, db_dir)
+            print(f"Round {round_number}: legacy {legacy:.0f} transfers/s, ledger {ledger:.0f} transfers/s "
+                  f"({ledger / legacy:.2f}x)")
+
+if __name__ == "__main__":
+    main()